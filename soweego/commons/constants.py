@@ -275,6 +275,7 @@ CLASSIFIERS = {
     'logistic_regression': keys.LOGISTIC_REGRESSION,
     'support_vector_machines': keys.SVM,
     'linear_support_vector_machines': keys.LINEAR_SVM,
+    'calibrated_linear_support_vector_machines': keys.CALIBRATED_LINEAR_SVM,
     'random_forest': keys.RANDOM_FOREST,
     'single_layer_perceptron': keys.SINGLE_LAYER_PERCEPTRON,
     'multi_layer_perceptron': keys.MULTI_LAYER_PERCEPTRON,
@@ -285,6 +286,7 @@ CLASSIFIERS = {
     'lr': keys.LOGISTIC_REGRESSION,  # Shorthand
     'svm': keys.SVM,  # Shorthand
     'lsvm': keys.LINEAR_SVM,  # Shorthand
+    'clsvm': keys.CALIBRATED_LINEAR_SVM,  # Shorthand
     'rf': keys.RANDOM_FOREST,  # Shorthand
     'slp': keys.SINGLE_LAYER_PERCEPTRON,  # Shorthand
     'mlp': keys.MULTI_LAYER_PERCEPTRON,  # Shorthand
@@ -324,6 +326,13 @@ PARAMETER_GRIDS = {
         # liblinear fails to converge when C values are 10 and 100 in some datasets
         'C': [0.01, 0.1, 1.0, 10, 100],
     },
+    keys.CALIBRATED_LINEAR_SVM: {
+        # Hyperparameters of the calibrated `LinearSVC`
+        'base_estimator__dual': [True, False],
+        'base_estimator__tol': [1e-3, 1e-4, 1e-5],
+        'base_estimator__max_iter': [1000, 2000],
+        'base_estimator__C': [0.01, 0.1, 1.0, 10, 100],
+    },
     keys.SVM: {
         # The execution takes too long when C=100 and kernel=linear
         'C': [0.01, 0.1, 1.0, 10],
@@ -14,6 +14,7 @@ import json
 import logging
 import re
 from collections import defaultdict
+from functools import lru_cache
 from typing import Iterable, Iterator, Optional
 from urllib.parse import unquote
 
@@ -28,6 +29,9 @@ from soweego.wikidata import api_requests, sparql_queries, vocabulary
 
 LOGGER = logging.getLogger(__name__)
 
+# Amount of rows fetched per round trip when streaming target links
+LINKS_PAGE_SIZE = 1000
+
 
 def gather_target_biodata(entity: str, catalog: str) -> Optional[Iterator[tuple]]:
     LOGGER.info(
@@ -318,8 +322,10 @@ def gather_target_links(entity: str, catalog: str) -> Optional[list]:
             return None
         LOGGER.info('Got %d links from %s %s', count, catalog, entity)
         # Slurp query result into a list:
-        # a generator here may break the DB connection
-        result = query.all()
+        # a generator here may break the DB connection.
+        # Stream rows in pages and keep plain tuples,
+        # so that the full result set is not buffered twice
+        result = [tuple(row) for row in query.yield_per(LINKS_PAGE_SIZE)]
         session.commit()
     except:
         session.rollback()
@@ -412,6 +418,10 @@ def gather_wikidata_links(wikidata, url_pids, ext_id_pids_to_urls):
     LOGGER.info('Got %d links', total)
 
 
+# SPARQL results change rarely, and compiling all regexes is expensive:
+# run them once per process.
+# Callers share the returned objects, so they must not modify them
+@lru_cache(maxsize=1)
 def gather_relevant_pids():
     url_pids = set()
     for result in sparql_queries.url_pids():
@@ -471,9 +481,12 @@ def gather_target_ids(entity, catalog, catalog_pid, aggregated):
         catalog_pid,
         0,
     ):
-        if not aggregated.get(qid):
-            aggregated[qid] = {keys.TID: set()}
-        aggregated[qid][keys.TID].add(target_id)
+        # Look the QID up only once per row
+        item = aggregated.get(qid)
+        if item is None:
+            aggregated[qid] = {keys.TID: {target_id}}
+        else:
+            item[keys.TID].add(target_id)
 
     LOGGER.info('Got %d %s identifiers', len(aggregated), catalog)
 
@@ -501,15 +514,19 @@ def extract_ids_from_urls(to_be_added, ext_id_pids_to_urls):
     LOGGER.info('Starting extraction of IDs from target links to be added ...')
     ext_ids_to_add = []
     urls_to_add = []
+    # The same URL may be shared by several identifiers:
+    # run the extraction only once per URL
+    extracted = {}
     for (
         qid,
         tid,
     ), urls in tqdm(to_be_added.items(), total=len(to_be_added)):
         for url in urls:
-            (
-                ext_id,
-                pid,
-            ) = url_utils.get_external_id_from_url(url, ext_id_pids_to_urls)
+            if url not in extracted:
+                extracted[url] = url_utils.get_external_id_from_url(
+                    url, ext_id_pids_to_urls
+                )
+            ext_id, pid = extracted[url]
             if ext_id is not None:
                 # Percent-decode IDs
                 if '%' in ext_id:
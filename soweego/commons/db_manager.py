@@ -12,6 +12,7 @@ __copyright__ = 'Copyleft 2018, lenzi.edoardo'
 import json
 import logging
 import os
+from functools import lru_cache
 from pkgutil import get_data
 
 from sqlalchemy import create_engine
@@ -77,9 +78,16 @@ class DBManager:
 
     @staticmethod
     def connect_to_db():
-        db_manager = DBManager()
-        session = db_manager.new_session()
-        return session
+        # Sessions are not shared: callers close them when done
+        return DBManager._get_default().new_session()
+
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def _get_default():
+        # Build the default engine only once per process:
+        # this reads the credentials and initializes the DB dialect.
+        # Connections are still not pooled
+        return DBManager()
 
     @staticmethod
     def get_credentials():
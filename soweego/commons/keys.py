@@ -99,6 +99,7 @@ REAL_NAME = 'real_name'
 NAIVE_BAYES = 'naive_bayes'
 LOGISTIC_REGRESSION = 'logistic_regression'
 LINEAR_SVM = 'linear_support_vector_machines'
+CALIBRATED_LINEAR_SVM = 'calibrated_linear_support_vector_machines'
 SVM = 'support_vector_machines'
 RANDOM_FOREST = 'random_forest'
 SINGLE_LAYER_PERCEPTRON = 'single_layer_perceptron'
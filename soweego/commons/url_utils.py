@@ -15,7 +15,6 @@ from functools import lru_cache
 from typing import Optional
 from urllib.parse import unquote, urlsplit
 
-import regex
 import requests.exceptions
 from requests import get
 from urllib3 import disable_warnings
@@ -211,6 +210,14 @@ def tokenize(url, domain_only=False) -> set:
     return tokens
 
 
+@lru_cache(maxsize=None)
+def _split_formatter_url(formatter_url):
+    # Formatter URLs are shared by all input URLs:
+    # split them into head & tail only once
+    before, _, after = formatter_url.partition('$1')
+    return before, after.rstrip('/')
+
+
 def get_external_id_from_url(url, ext_id_pids_to_urls):
     LOGGER.debug('Trying to extract an identifier from <%s>', url)
 
@@ -228,11 +235,9 @@ def get_external_id_from_url(url, ext_id_pids_to_urls):
 
             # Optimal case: match the original input URL against a full URL regex
             if url_regex is not None:
-                match = (
-                    re.match(url_regex, url)
-                    if isinstance(url_regex, re.Pattern)
-                    else regex.match(url_regex, url)
-                )
+                # Regexes are precompiled by either `re` or `regex`:
+                # match them directly
+                match = url_regex.match(url)
                 if match is not None:
                     groups = match.groups()
                     # This shouldn't happen, but who knows?
@@ -260,8 +265,7 @@ def get_external_id_from_url(url, ext_id_pids_to_urls):
 
             # No URL regex: best matching effort using the tidy URL
             # Look for matching head & tail
-            before, _, after = formatter_url.partition('$1')
-            after = after.rstrip('/')
+            before, after = _split_formatter_url(formatter_url)
             if tidy.startswith(before) and tidy.endswith(after):
                 LOGGER.debug(
                     'Clean URL matches external ID formatter URL: <%s> -> <%s>',
@@ -288,11 +292,7 @@ def get_external_id_from_url(url, ext_id_pids_to_urls):
                 # Use `re.match` instead of `re.search`
                 # More precision, less recall:
                 # valid IDs may be left in the URLs output
-                match = (
-                    re.match(id_regex, url_fragment)
-                    if isinstance(id_regex, re.Pattern)
-                    else regex.match(id_regex, url_fragment)
-                )
+                match = id_regex.match(url_fragment)
                 # Give up if the ID regex doesn't match
                 if match is None:
                     LOGGER.debug(
@@ -58,10 +58,10 @@ def make_buckets(dataset, bucket_size=1000):
 def prepare_stratified_k_fold(k, dataset, positive_samples_index):
     k_fold = StratifiedKFold(n_splits=k, shuffle=True, random_state=610)
     # scikit's stratified k-fold no longer supports multi-label data representation.
-    # It expects a binary array instead, so build it based on the positive samples index
-    binary_target_variables = dataset.index.map(
-        lambda x: 1 if x in positive_samples_index else 0
-    )
+    # It expects a binary array instead, so build it
+    # based on the positive samples index.
+    # Vectorized membership: a per-pair lookup is way slower on large datasets
+    binary_target_variables = dataset.index.isin(positive_samples_index).astype(int)
     return k_fold, binary_target_variables
 
 
@@ -79,6 +79,10 @@ def init_model(classifier: str, num_features: int, **kwargs):
         kwargs = {**constants.LINEAR_SVM_PARAMS, **kwargs}
         model = rl.SVMClassifier(**kwargs)
 
+    elif classifier is keys.CALIBRATED_LINEAR_SVM:
+        kwargs = {**constants.LINEAR_SVM_PARAMS, **kwargs}
+        model = classifiers.CalibratedLinearSVMClassifier(**kwargs)
+
     elif classifier is keys.SVM:
         model = classifiers.SVCClassifier(**kwargs)
 
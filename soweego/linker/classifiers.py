@@ -22,15 +22,18 @@ __copyright__ = 'Copyleft 2019, Hjfocs, tupini07'
 import logging
 import os
 from contextlib import redirect_stderr
+from multiprocessing import cpu_count
 
 import numpy as np
 import pandas as pd
+from joblib import Parallel, delayed
 from mlens.ensemble import SuperLearner
 from recordlinkage.adapters import KerasAdapter, SKLearnAdapter
 from recordlinkage.base import BaseClassifier
+from sklearn.calibration import CalibratedClassifierCV
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.ensemble import VotingClassifier as SKVotingClassifier
-from sklearn.svm import SVC
+from sklearn.svm import SVC, LinearSVC
 
 from soweego.commons import constants, utils
 
@@ -45,6 +48,10 @@ with redirect_stderr(open(os.devnull, 'w')):
 
 LOGGER = logging.getLogger(__name__)
 
+# Prefix of hyperparameters that `sklearn.calibration.CalibratedClassifierCV`
+# passes to the estimator it wraps
+_BASE_ESTIMATOR_PREFIX = 'base_estimator__'
+
 
 # Small wrapper around 'KerasClassifier'. Its only use is to overwrite
 # the predict method so that the returned output is (n_samples) instead of
@@ -55,10 +62,11 @@ class _KerasClassifierWrapper(KerasClassifier):
 
 
 def _get_proba_sklearn_base_classifier(
-    clf: BaseClassifier, features: pd.DataFrame
+    clf: BaseClassifier, features: pd.DataFrame, n_jobs: int = 1
 ) -> pd.Series:
     """Returns the probabilities of a positive match by applying the
-    classifier to the provided feature vectors"""
+    classifier to the provided feature vectors. If `n_jobs` > 1, feature
+    vectors are split into batches that are classified in parallel threads"""
 
     match_class = clf.kernel.classes_[1]
 
@@ -74,7 +82,16 @@ def _get_proba_sklearn_base_classifier(
     # `0` for non-matches, `1` for matches.
     # We only need the probability of being a match,
     # so we return the second column
-    classifications = clf.kernel.predict_proba(features)[:, 1]
+    n_jobs = min(n_jobs, len(features))
+    if n_jobs > 1:
+        batches = np.array_split(features.to_numpy(), n_jobs)
+        classifications = np.concatenate(
+            Parallel(n_jobs=n_jobs, prefer='threads')(
+                delayed(clf.kernel.predict_proba)(batch) for batch in batches
+            )
+        )[:, 1]
+    else:
+        classifications = clf.kernel.predict_proba(features)[:, 1]
 
     return pd.Series(classifications, index=features.index)
 
@@ -121,7 +138,11 @@ class _BaseNeuralNetwork(KerasAdapter, BaseClassifier):
                     verbose=2,
                     restore_best_weights=True,
                 ),
-                ModelCheckpoint(model_path, save_best_only=True),
+                # Best weights are already restored by early stopping:
+                # skip serializing the whole model at each improvement
+                ModelCheckpoint(
+                    model_path, save_best_only=True, save_weights_only=True
+                ),
             ],
         )
 
@@ -226,11 +247,20 @@ class SVCClassifier(SKLearnAdapter, BaseClassifier):
     - can use non-linear kernels
     - higher training time (quadratic to the number of samples)
 
+    Probability scores are computed in parallel threads:
+    pass ``n_jobs`` to set how many. Default: the number of CPUs.
+
     """
 
+    # Fallback for models trained before `n_jobs` was introduced
+    n_jobs = cpu_count()
+
     def __init__(self, *args, **kwargs):
         super(SVCClassifier, self).__init__()
 
+        # Extra CLI arguments are cast to float
+        self.n_jobs = int(kwargs.pop('n_jobs', cpu_count()))
+
         kwargs['probability'] = kwargs.get('probability', True)
 
         self.kernel = SVC(*args, **kwargs)
@@ -247,6 +277,62 @@ class SVCClassifier(SKLearnAdapter, BaseClassifier):
         :return: the classification results
         """
 
+        # libsvm releases the GIL while scoring
+        return _get_proba_sklearn_base_classifier(
+            self, feature_vectors, n_jobs=self.n_jobs
+        )
+
+    def __repr__(self):
+        return f'{self.kernel}'
+
+
+class CalibratedLinearSVMClassifier(SKLearnAdapter, BaseClassifier):
+    """A linear support-vector machine classifier with probability scores.
+
+    This class implements :class:`sklearn.calibration.CalibratedClassifierCV`
+    over :class:`sklearn.svm.LinearSVC`, which receives the same parameters.
+
+    It differs from
+    :class:`recordlinkage.classifiers.SVMClassifier`, which implements
+    a plain :class:`sklearn.svm.LinearSVC`, and from :class:`SVCClassifier`
+    with ``kernel='linear'``, which is based on libsvm.
+
+    Main highlights:
+
+    - output probability scores, via Platt scaling over 5 folds
+    - lower training time (linear to the number of samples)
+
+    """
+
+    def __init__(self, *args, **kwargs):
+        super(CalibratedLinearSVMClassifier, self).__init__()
+
+        # Tuned hyperparameters are prefixed with the wrapped estimator name:
+        # strip it, so that they override the defaults
+        kwargs = {
+            (
+                key[len(_BASE_ESTIMATOR_PREFIX) :]
+                if key.startswith(_BASE_ESTIMATOR_PREFIX)
+                else key
+            ): value
+            for key, value in kwargs.items()
+        }
+
+        self.kernel = CalibratedClassifierCV(
+            LinearSVC(*args, **kwargs), cv=5, method='sigmoid', n_jobs=-1
+        )
+
+    def prob(self, feature_vectors: pd.DataFrame) -> pd.Series:
+        """Classify record pairs and include the probability score
+        of being a match.
+
+        :param feature_vectors: a :class:`DataFrame <pandas.DataFrame>`
+          computed via record pairs comparison. This should be
+          :meth:`recordlinkage.Compare.compute` output.
+          See :func:`extract_features() <soweego.linker.workflow.extract_features>`
+          for more details
+        :return: the classification results
+        """
         return _get_proba_sklearn_base_classifier(self, feature_vectors)
 
     def __repr__(self):
@@ -18,8 +18,7 @@ import click
 import joblib
 import recordlinkage as rl
 from keras import backend as K
-from numpy import mean, std
-from pandas import concat
+from numpy import asarray, mean, std
 from sklearn.model_selection import GridSearchCV, StratifiedKFold
 
 from soweego.commons import constants, target_database, utils
@@ -355,38 +354,38 @@ def _nested_k_fold_with_grid_search(
 
 
 def _average_k_fold(classifier, catalog, entity, k, dir_io, **kwargs):
-    predictions, precisions, recalls, f_scores = None, [], [], []
+    fold_predictions, precisions, recalls, f_scores = [], [], [], []
     dataset, positive_samples_index = train.build_training_set(catalog, entity, dir_io)
     k_fold, binary_target_variables = utils.prepare_stratified_k_fold(
         k, dataset, positive_samples_index
     )
+    # Models are fit from scratch at each call,
+    # so initialize once and reuse across folds
+    model = utils.init_model(classifier, dataset.shape[1], **kwargs)
+    # Dataset rows that are positive samples: slicing this mask per fold
+    # is much cheaper than intersecting indices
+    positives = asarray(binary_target_variables, dtype=bool)
 
     for train_index, test_index in k_fold.split(dataset, binary_target_variables):
         training, test = dataset.iloc[train_index], dataset.iloc[test_index]
 
-        model = utils.init_model(classifier, dataset.shape[1], **kwargs)
-
-        model.fit(training, positive_samples_index & training.index)
+        model.fit(training, training.index[positives[train_index]])
 
         preds = model.predict(test)
 
-        K.clear_session()  # Free memory
-
         p, r, f, _ = _compute_performance(
-            positive_samples_index & test.index, preds, len(test)
+            test.index[positives[test_index]], preds, len(test)
         )
 
-        if predictions is None:
-            predictions = preds
-        else:
-            predictions |= preds
-
+        fold_predictions.append(preds)
         precisions.append(p)
         recalls.append(r)
         f_scores.append(f)
 
+    K.clear_session()  # Free memory
+
     return (
-        predictions,
+        _union(fold_predictions),
         mean(precisions),
         std(precisions),
         mean(recalls),
@@ -397,33 +396,38 @@ def _average_k_fold(classifier, catalog, entity, k, dir_io, **kwargs):
 
 
 def _single_k_fold(classifier, catalog, entity, k, dir_io, **kwargs):
-    predictions, test_set = None, []
+    fold_predictions = []
     dataset, positive_samples_index = train.build_training_set(catalog, entity, dir_io)
     k_fold, binary_target_variables = utils.prepare_stratified_k_fold(
         k, dataset, positive_samples_index
     )
+    # Models are fit from scratch at each call,
+    # so initialize once and reuse across folds
+    model = utils.init_model(classifier, dataset.shape[1], **kwargs)
+    # Dataset rows that are positive samples: slicing this mask per fold
+    # is much cheaper than intersecting indices
+    positives = asarray(binary_target_variables, dtype=bool)
 
     for train_index, test_index in k_fold.split(dataset, binary_target_variables):
         training, test = dataset.iloc[train_index], dataset.iloc[test_index]
-        test_set.append(test)
 
-        model = utils.init_model(classifier, dataset.shape[1], **kwargs)
-        model.fit(training, positive_samples_index & training.index)
+        model.fit(training, training.index[positives[train_index]])
 
         preds = model.predict(test)
 
-        K.clear_session()  # Free memory
+        fold_predictions.append(preds)
 
-        if predictions is None:
-            predictions = preds
-        else:
-            predictions |= preds
+    K.clear_session()  # Free memory
 
-    test_set = concat(test_set)
+    predictions = _union(fold_predictions)
 
     return (
         predictions,
-        _compute_performance(
-            positive_samples_index & test_set.index, predictions, len(test_set)
-        ),
+        # Test folds span the whole dataset
+        _compute_performance(dataset.index[positives], predictions, len(dataset)),
     )
+
+
+def _union(indices):
+    # Single pass union, instead of rebuilding the result at each fold
+    return indices[0].append(indices[1:]).drop_duplicates()
@@ -9,25 +9,29 @@ __version__ = '1.0'
 __license__ = 'GPL-3.0'
 __copyright__ = 'Copyleft 2018, Hjfocs'
 
+import gzip
 import logging
 import os
+import re
 import sys
-from re import search
-from typing import Iterator, Tuple
+from functools import lru_cache
+from typing import Iterator
 
 import click
 import joblib
 import pandas as pd
 import recordlinkage as rl
 from keras import backend as K
-from numpy import full, nan
+from numpy import float32, fromiter
 
 from soweego.commons import constants, keys, target_database
 from soweego.ingester import wikidata_bot
-from soweego.linker import blocking, classifiers, workflow
+from soweego.linker import classifiers, workflow
 
 LOGGER = logging.getLogger(__name__)
 
+QID_PATTERN = re.compile(constants.QID_REGEX)
+
 
 @click.command()
 @click.argument('classifier', type=click.Choice(constants.CLASSIFIERS))
@@ -83,13 +87,15 @@ def cli(classifier, catalog, entity, threshold, name_rule, upload, sandbox, dir_
 
     rl.set_option(*constants.CLASSIFICATION_RETURN_SERIES)
 
-    for i, chunk in enumerate(
-        execute(model_path, catalog, entity, threshold, name_rule, dir_io)
-    ):
-        chunk.to_csv(result_path, mode='a', header=False)
+    # Open the output once: a single gzip stream for all chunks
+    with gzip.open(result_path, 'wt') as fout:
+        for i, chunk in enumerate(
+            execute(model_path, catalog, entity, threshold, name_rule, dir_io)
+        ):
+            chunk.to_csv(fout, header=False)
 
-        if upload:
-            _upload(chunk, i, catalog, entity, sandbox)
+            if upload:
+                _upload(chunk, i, catalog, entity, sandbox)
 
     # Free memory in case of neural networks:
     # can be done only after classification
@@ -101,6 +107,8 @@ def cli(classifier, catalog, entity, threshold, name_rule, upload, sandbox, dir_
         keys.STACKED_CLASSIFIER,
     ):
         K.clear_session()  # Clear the TensorFlow graph
+        # Cached models point to the cleared graph
+        _load_classifier.cache_clear()
 
     LOGGER.info('Linking completed')
 
@@ -112,6 +120,7 @@ def execute(
     threshold: float,
     name_rule: bool,
     dir_io: str,
+    classifier=None,
 ) -> Iterator[pd.Series]:
     """Run a supervised linker.
 
@@ -132,25 +141,35 @@ def execute(
       are discarded after classification
     :param dir_io: input/output directory where working files
       will be read/written
+    :param classifier: (optional) an already loaded model.
+      If given, ``model_path`` is not read
     :return: the generator yielding chunks of links
     """
-    classifier = joblib.load(model_path)
+    if classifier is None:
+        classifier = _load_classifier(model_path, os.path.getmtime(model_path))
+    expected_features = _get_expected_features(classifier)
+    classify = (
+        # LSVM doesn't support probability scores
+        classifier.predict
+        if isinstance(classifier, rl.SVMClassifier)
+        else classifier.prob
+    )
 
-    for (
-        wd_chunk,
-        target_chunk,
-        feature_vectors,
-    ) in _classification_set_generator(catalog, entity, dir_io):
+    # Target DB queries of the next chunk run in the background
+    # while the current one is classified
+    for wd_chunk, target_chunk, feature_vectors in workflow.build_chunks(
+        'classification', catalog, entity, dir_io
+    ):
         # The classification set must have the same feature space
         # as the training one
-        _add_missing_feature_columns(classifier, feature_vectors)
-
-        predictions = (
-            # LSVM doesn't support probability scores
-            classifier.predict(feature_vectors)
-            if isinstance(classifier, rl.SVMClassifier)
-            else classifier.prob(feature_vectors)
+        feature_vectors = _add_missing_feature_columns(
+            classifier, expected_features, feature_vectors
         )
+        # Features are similarity scores in [0, 1]:
+        # single precision is enough and halves memory traffic
+        feature_vectors = feature_vectors.astype(float32, copy=False)
+
+        predictions = classify(feature_vectors)
 
         predictions = _apply_linking_rules(
             name_rule, predictions, target_chunk, wd_chunk
@@ -158,60 +177,28 @@ def execute(
 
         yield _get_unique_predictions_above_threshold(predictions, threshold)
 
+        # Release the current chunk as soon as it's handed over,
+        # so that it doesn't outlive the build of the next one
+        del wd_chunk, target_chunk, feature_vectors, predictions
 
-def _classification_set_generator(
-    catalog, entity, dir_io
-) -> Iterator[Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]]:
-    goal = 'classification'
-
-    # Wikidata side
-    wd_reader = workflow.build_wikidata(goal, catalog, entity, dir_io)
-    wd_generator = workflow.preprocess_wikidata(goal, wd_reader)
-
-    for i, wd_chunk in enumerate(wd_generator, 1):
-        # Collect samples via queries to the target DB
-        samples = blocking.find_samples(
-            goal,
-            catalog,
-            wd_chunk[keys.NAME_TOKENS],
-            i,
-            target_database.get_main_entity(catalog, entity),
-            dir_io,
-        )
-
-        # Build target chunk from samples
-        target_reader = workflow.build_target(
-            goal, catalog, entity, set(samples.get_level_values(keys.TID))
-        )
-
-        # Preprocess target chunk
-        target_chunk = workflow.preprocess_target(goal, target_reader)
-
-        # Extract features
-        features_path = os.path.join(
-            dir_io, constants.FEATURES.format(catalog, entity, goal, i)
-        )
-        feature_vectors = workflow.extract_features(
-            samples, wd_chunk, target_chunk, features_path
-        )
-
-        yield wd_chunk, target_chunk, feature_vectors
 
-        LOGGER.info('Chunk %d classified', i)
+# The modification time is part of the cache key,
+# so that a retrained model gets loaded again.
+# Keep just one model in memory: they can be large
+@lru_cache(maxsize=1)
+def _load_classifier(model_path: str, mtime: float):
+    LOGGER.info("Loading model from '%s' ...", model_path)
+    return joblib.load(model_path)
 
 
 def _apply_linking_rules(name_rule, predictions, target_chunk, wd_chunk):
     # Full name rule: if names differ, it's not a link
     if name_rule:
         LOGGER.info('Applying full names rule ...')
-        predictions = pd.DataFrame(predictions).apply(
-            _zero_when_different_names, axis=1, args=(wd_chunk, target_chunk)
-        )
+        predictions = _zero_when_different_names(predictions, wd_chunk, target_chunk)
     # Wikidata URL rule: if the target ID has a Wikidata URL, it's a link
     if target_chunk.get(keys.URL) is not None:
-        predictions = pd.DataFrame(predictions).apply(
-            _one_when_wikidata_link_correct, axis=1, args=(target_chunk,)
-        )
+        predictions = _one_when_wikidata_link_correct(predictions, target_chunk)
     return predictions
 
 
@@ -255,7 +242,9 @@ def _handle_io(classifier, catalog, entity, dir_io):
 
 
 def _upload(chunk, chunk_number, catalog, entity, sandbox):
-    links = dict(chunk.to_dict().keys())
+    # Read (QID, target ID) pairs straight from the index,
+    # no need to materialize the scores
+    links = dict(zip(chunk.index.get_level_values(0), chunk.index.get_level_values(1)))
 
     LOGGER.info('Starting upload of links to Wikidata, chunk %d ...', chunk_number)
 
@@ -264,7 +253,7 @@ def _upload(chunk, chunk_number, catalog, entity, sandbox):
     LOGGER.info('Upload to Wikidata completed, chunk %d', chunk_number)
 
 
-def _add_missing_feature_columns(classifier, feature_vectors: pd.DataFrame):
+def _get_expected_features(classifier) -> int:
     # Handle amount of features depending on the classifier
     expected_features: int
     if isinstance(classifier, rl.NaiveBayesClassifier):
@@ -277,6 +266,9 @@ def _add_missing_feature_columns(classifier, feature_vectors: pd.DataFrame):
     elif isinstance(classifier, classifiers.SVCClassifier):
         expected_features = classifier.kernel.shape_fit_[1]
 
+    elif isinstance(classifier, classifiers.CalibratedLinearSVMClassifier):
+        expected_features = classifier.kernel.n_features_in_
+
     elif isinstance(classifier, rl.SVMClassifier):
         expected_features = classifier.kernel.coef_.shape[1]
 
@@ -303,6 +295,12 @@ def _add_missing_feature_columns(classifier, feature_vectors: pd.DataFrame):
         LOGGER.critical(err_msg)
         raise ValueError(err_msg)
 
+    return expected_features
+
+
+def _add_missing_feature_columns(
+    classifier, expected_features: int, feature_vectors: pd.DataFrame
+) -> pd.DataFrame:
     actual_features = feature_vectors.shape[1]
 
     if expected_features != actual_features:
@@ -314,54 +312,98 @@ def _add_missing_feature_columns(classifier, feature_vectors: pd.DataFrame):
             expected_features,
         )
 
-        for i in range(expected_features - actual_features):
-            feature_vectors[f'missing_{i}'] = full(
-                len(feature_vectors), constants.FEATURE_MISSING_VALUE
-            )
+        # Add all missing columns at once
+        missing = [f'missing_{i}' for i in range(expected_features - actual_features)]
+        feature_vectors = feature_vectors.reindex(
+            columns=feature_vectors.columns.append(pd.Index(missing)),
+            fill_value=constants.FEATURE_MISSING_VALUE,
+        )
+
+    return feature_vectors
+
 
+def _zero_when_different_names(predictions, wikidata, target):
+    # Gather names once per chunk, then compare them in a single pass
+    # over the (QID, target ID) pairs, instead of a row-wise `apply`
+    wd_names = _gather_names(wikidata)
+    target_names = _gather_names(target) if wd_names else {}
 
-# See https://stackoverflow.com/a/18317089/10719765
-# for `pandas` implementation details
-def _zero_when_different_names(prediction, wikidata, target):
-    wd_names, target_names = set(), set()
-    qid, tid = prediction.name
+    # No names on one side means no shared names for any pair
+    if not wd_names or not target_names:
+        return pd.Series(0.0, index=predictions.index)
+
+    empty = frozenset()
+
+    shared_names = fromiter(
+        (
+            not wd_names.get(qid, empty).isdisjoint(target_names.get(tid, empty))
+            for qid, tid in predictions.index
+        ),
+        dtype=bool,
+        count=len(predictions),
+    )
+
+    return predictions.where(shared_names, 0.0)
+
+
+def _gather_names(dataset):
+    # Map each identifier to the set of its names, across all name columns
+    names = {}
 
     for column in constants.NAME_FIELDS:
-        if wikidata.get(column) is not None:
-            values = wikidata.loc[qid][column]
+        if dataset.get(column) is None:
+            continue
+
+        for identifier, values in dataset[column].items():
+            if isinstance(values, list):
+                names.setdefault(identifier, set()).update(values)
+
+    return names
 
-            if values is not nan:
-                wd_names.update(set(values))
 
-        if target.get(column) is not None:
-            values = target.loc[tid][column]
+def _one_when_wikidata_link_correct(predictions, target):
+    # Look for Wikidata URLs once per target ID,
+    # instead of once per (QID, target ID) pair
+    tid_to_qid = _gather_wikidata_qids(target)
 
-            if values is not nan:
-                target_names.update(set(values))
+    # Wikidata URLs are sparse: often there's nothing to update
+    if not tid_to_qid:
+        return predictions
 
-    return 0.0 if wd_names.isdisjoint(target_names) else prediction[0]
+    qids = predictions.index.get_level_values(0)
+    tids = predictions.index.get_level_values(1)
+    to_update = tids.isin(list(tid_to_qid))
 
+    new_scores = predictions.to_numpy(dtype=float, copy=True)
+    new_scores[to_update] = [
+        float(qid == tid_to_qid[tid])
+        for qid, tid in zip(qids[to_update], tids[to_update])
+    ]
 
-def _one_when_wikidata_link_correct(prediction, target):
-    qid, tid = prediction.name
-    urls = target.loc[tid][keys.URL]
+    return pd.Series(new_scores, index=predictions.index)
+
+
+def _gather_wikidata_qids(target):
+    # Map each target ID to the QID of its first Wikidata URL, if any
+    tid_to_qid = {}
+
+    for tid, urls in target[keys.URL].items():
+        if not urls:
+            continue
 
-    if urls:
         for url in urls:
             if url and 'wikidata' in url:
-                has_qid = search(constants.QID_REGEX, url)
+                has_qid = QID_PATTERN.search(url)
 
                 if has_qid:
-                    new_score = 1.0 if qid == has_qid.group() else 0.0
-
                     LOGGER.debug(
-                        'Wikidata URL detected in %s target ID: %s '
-                        'Will update the confidence score from %f to %f',
-                        (qid, tid),
+                        'Wikidata URL detected in target ID %s: %s. '
+                        'Will set the confidence score of its links to 1 '
+                        'if the QID matches, 0 otherwise',
+                        tid,
                         url,
-                        prediction[0],
-                        new_score,
                     )
-                    return new_score
+                    tid_to_qid[tid] = has_qid.group()
+                    break
 
-    return prediction[0]
+    return tid_to_qid
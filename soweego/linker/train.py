@@ -22,7 +22,7 @@ from recordlinkage.base import BaseClassifier
 from sklearn.model_selection import GridSearchCV
 
 from soweego.commons import constants, keys, target_database, utils
-from soweego.linker import blocking, workflow
+from soweego.linker import workflow
 
 LOGGER = logging.getLogger(__name__)
 
@@ -164,59 +164,24 @@ def build_training_set(
       Positive samples are catalog IDs available in Wikidata
     """
     goal = 'training'
+    positive_samples, feature_vectors = [], []
 
-    # Wikidata side
-    wd_reader = workflow.build_wikidata(goal, catalog, entity, dir_io)
-    wd_generator = workflow.preprocess_wikidata(goal, wd_reader)
-
-    positive_samples, feature_vectors = None, None
-
-    for i, wd_chunk in enumerate(wd_generator, 1):
-        # Positive samples come from Wikidata
-        if positive_samples is None:
-            positive_samples = wd_chunk[keys.TID]
-        else:
-            # We concatenate the current chunk
-            # and reset `positive_samples` at each iteration,
-            # instead of appending each chunk to a list,
-            # then concatenate it at the end of the loop.
-            # Reason: keeping multiple yet small pandas objects
-            # is less memory-efficient
-            positive_samples = pd.concat([positive_samples, wd_chunk[keys.TID]])
-
-        # All samples come from queries to the target DB
-        # and include negative ones
-        all_samples = blocking.find_samples(
-            goal,
-            catalog,
-            wd_chunk[keys.NAME_TOKENS],
-            i,
-            target_database.get_main_entity(catalog, entity),
-            dir_io,
-        )
-
-        # Build target chunk from all samples
-        target_reader = workflow.build_target(
-            goal, catalog, entity, set(all_samples.get_level_values(keys.TID))
-        )
-        # Preprocess target chunk
-        target_chunk = workflow.preprocess_target(goal, target_reader)
-
-        features_path = os.path.join(
-            dir_io, constants.FEATURES.format(catalog, entity, goal, i)
-        )
-
-        # Extract features from all samples
-        chunk_fv = workflow.extract_features(
-            all_samples, wd_chunk, target_chunk, features_path
-        )
-
-        if feature_vectors is None:
-            feature_vectors = chunk_fv
-        else:
-            feature_vectors = pd.concat([feature_vectors, chunk_fv], sort=False)
-
-    # Final positive samples index
+    for wd_chunk, target_chunk, chunk_feature_vectors in workflow.build_chunks(
+        goal, catalog, entity, dir_io
+    ):
+        # Positive samples come from Wikidata.
+        # Copy them: the column is a view that would keep
+        # the whole Wikidata chunk alive
+        positive_samples.append(wd_chunk[keys.TID].copy())
+        feature_vectors.append(chunk_feature_vectors)
+
+        # Release the current chunk before the next one is built
+        del wd_chunk, target_chunk, chunk_feature_vectors
+
+    # Final positive samples index.
+    # Concatenate once: doing it at each chunk copies
+    # all previous samples every time
+    positive_samples = pd.concat(positive_samples)
     positive_samples_index = pd.MultiIndex.from_tuples(
         zip(positive_samples.index, positive_samples),
         names=[keys.QID, keys.TID],
@@ -224,7 +189,10 @@ def build_training_set(
 
     LOGGER.info('Built positive samples index from Wikidata')
 
-    feature_vectors = feature_vectors.fillna(constants.FEATURE_MISSING_VALUE)
+    # Concatenate once: doing it at each chunk is quadratic
+    feature_vectors = pd.concat(feature_vectors, sort=False)
+    # Fill in place: the matrix is the largest object in memory
+    feature_vectors.fillna(constants.FEATURE_MISSING_VALUE, inplace=True)
 
     return feature_vectors, positive_samples_index
 
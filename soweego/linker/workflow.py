@@ -10,14 +10,17 @@ It is a pipeline composed of the following main steps:
 3. extract features by comparing pairs of Wikidata and target values
    (:func:`extract_features`)
 
+:func:`build_chunks` runs all steps chunk by chunk.
+
 """
 import datetime
 import gzip
 import json
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
 from multiprocessing import cpu_count
-from typing import Iterator, Set
+from typing import Iterator, Set, Tuple
 
 import pandas as pd
 import recordlinkage as rl
@@ -31,7 +34,7 @@ from soweego.commons import (
 )
 from soweego.commons.db_manager import DBManager
 from soweego.commons.logging import log_dataframe_info
-from soweego.linker import features
+from soweego.linker import blocking, features
 from soweego.wikidata import api_requests, vocabulary
 
 __author__ = 'Marco Fossati'
@@ -433,6 +436,90 @@ def extract_features(
     return feature_vectors
 
 
+def build_chunks(
+    goal: str, catalog: str, entity: str, dir_io: str
+) -> Iterator[Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]]:
+    """Build Wikidata and target datasets, preprocess them,
+    and extract their features chunk by chunk: workflow steps 1 to 3.
+
+    Target DB queries of a chunk run in a background thread
+    while features of the previous chunk are extracted,
+    and while the caller consumes them.
+    Blocking and feature extraction stay in the calling thread:
+    they already use all CPUs.
+
+    Data of at most 2 chunks is alive at the same time, as long as
+    the caller releases each chunk before requesting the next one.
+    Otherwise, the caller keeps a third chunk alive.
+
+    :param goal: ``{'training', 'classification'}``.
+      Whether to build datasets for training or classification
+    :param catalog: ``{'discogs', 'imdb', 'musicbrainz'}``.
+      A supported catalog
+    :param entity: ``{'actor', 'band', 'director', 'musician', 'producer',
+      'writer', 'audiovisual_work', 'musical_work'}``.
+      A supported entity
+    :param dir_io: input/output directory where working files
+      will be read/written
+    :return: the generator yielding Wikidata chunk, target chunk,
+      and feature vectors triples
+    """
+    # Wikidata side
+    wd_reader = build_wikidata(goal, catalog, entity, dir_io)
+    wd_generator = preprocess_wikidata(goal, wd_reader)
+
+    # Chunk i-1 stays alive while chunk i is built:
+    # the caller must release each chunk to keep this bound
+    previous = None
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        for i, wd_chunk in enumerate(wd_generator, 1):
+            # Samples come from queries to the target DB
+            # and include negative ones.
+            # No background thread is running here:
+            # blocking forks a process pool
+            samples = blocking.find_samples(
+                goal,
+                catalog,
+                wd_chunk[keys.NAME_TOKENS],
+                i,
+                target_database.get_main_entity(catalog, entity),
+                dir_io,
+            )
+
+            # Build and preprocess the target chunk in the background
+            target_chunk = executor.submit(
+                _build_target_chunk, goal, catalog, entity, samples
+            )
+
+            if previous is not None:
+                yield _extract_chunk_features(goal, catalog, entity, dir_io, *previous)
+
+            previous = i, wd_chunk, samples, target_chunk.result()
+
+        if previous is not None:
+            yield _extract_chunk_features(goal, catalog, entity, dir_io, *previous)
+
+
+def _build_target_chunk(goal, catalog, entity, samples):
+    target_reader = build_target(
+        goal, catalog, entity, set(samples.get_level_values(keys.TID))
+    )
+    return preprocess_target(goal, target_reader)
+
+
+def _extract_chunk_features(
+    goal, catalog, entity, dir_io, i, wd_chunk, samples, target_chunk
+):
+    features_path = os.path.join(
+        dir_io, constants.FEATURES.format(catalog, entity, goal, i)
+    )
+    feature_vectors = extract_features(samples, wd_chunk, target_chunk, features_path)
+
+    LOGGER.info('Chunk %d ready', i)
+
+    return wd_chunk, target_chunk, feature_vectors
+
+
 def _add_date_features(feature_extractor, in_both_datasets):
     birth_column, death_column = keys.DATE_OF_BIRTH, keys.DATE_OF_DEATH
 
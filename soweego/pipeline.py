@@ -99,4 +99,5 @@ def _invoke_no_exit(function: Callable, args: list):
         function(args)
     except SystemExit:
         pass
-    LOGGER.debug("GC collect %s\n" % gc.collect())
+    # Free cyclic garbage left by the step before running the next one
+    LOGGER.debug("GC collect %s", gc.collect())
@@ -48,6 +48,9 @@ BIO_STATEMENTS_TO_BE_ADDED_FNAME = '{catalog}_{entity}_bio_statements_to_be_adde
 QID_PREFIX = 'https://www.wikidata.org/wiki/'
 PID_PREFIX = QID_PREFIX + 'Property:'
 
+# Max amount of identifiers per target DB lookup query
+ID_LOOKUP_BATCH_SIZE = 1000
+
 
 @click.command()
 @click.argument('catalog', type=click.Choice(target_database.supported_targets()))
@@ -454,17 +457,25 @@ def dead_ids(catalog: str, entity: str, wd_cache=None) -> Tuple[DefaultDict, Dic
     session = DBManager.connect_to_db()
 
     try:
+        # Look identifiers up in batches:
+        # one query per identifier is dominated by DB round trips
+        tids = list({tid for qid in wd_ids for tid in wd_ids[qid][keys.TID]})
+        existing = set()
+        for i in range(0, len(tids), ID_LOOKUP_BATCH_SIZE):
+            batch = tids[i : i + ID_LOOKUP_BATCH_SIZE]
+            existing.update(
+                _normalize_catalog_id(row.catalog_id)
+                for row in session.query(db_entity.catalog_id).filter(
+                    db_entity.catalog_id.in_(batch)
+                )
+            )
+        session.commit()
+
         for qid in wd_ids:
             for tid in wd_ids[qid][keys.TID]:
-                existing = (
-                    session.query(db_entity.catalog_id)
-                    .filter_by(catalog_id=tid)
-                    .count()
-                )
-                if existing == 0:
+                if _normalize_catalog_id(tid) not in existing:
                     LOGGER.debug('%s %s identifier %s is dead', qid, catalog, tid)
                     dead[tid].add(qid)
-        session.commit()
     except SQLAlchemyError as error:
         LOGGER.error(
             "Failed query of target catalog identifiers due to %s. "
@@ -736,8 +747,8 @@ def _validate(criterion, wd, target_data, deprecate, add, reference, wd_only):
         # 1 or tiny loop size: total target IDs per Wikidata item
         # (it should almost always be 1)
         for tid in wd_tids:
-            if tid in target.keys():
-                target_data = target.get(tid)
+            if tid in target:
+                target_data = target[tid]
 
                 # Skip when no target data
                 if not target_data:
@@ -1000,3 +1011,9 @@ def _prepare_target(dataset):
         else:  # Biographical data
             target[identifier].add(tuple(data))
     return target
+
+
+def _normalize_catalog_id(catalog_id):
+    # Mimic the target DB collation when comparing identifiers:
+    # it is case-insensitive and ignores trailing spaces
+    return catalog_id.rstrip(' ').lower()